@@ -12,18 +12,51 @@ st.sidebar.title("📈 Analizador Cool de Portafolio de Inversión")
 
 # Funciones auxiliares
 
+SQRT252 = np.sqrt(252)
+
+def calcular_momentos(returns):
+    # Media y covarianza diarias, calculadas una sola vez por optimización.
+    # La covarianza muestral sale de un solo producto de la matriz centrada (más rápido que np.cov).
+    R = np.ascontiguousarray(returns.values, dtype=np.float64)
+    mu = R.mean(axis=0)
+    centered = R - mu
+    cov_matrix = centered.T @ centered / (len(R) - 1)
+    return mu, cov_matrix
+
+# Objetivos de optimización y sus gradientes sobre ndarray
+def _varianza_objetivo(weights, cov_matrix):
+    return np.dot(weights, np.dot(cov_matrix, weights))
+
+def _varianza_objetivo_jac(weights, cov_matrix):
+    return 2 * np.dot(cov_matrix, weights)
+
+def _volatilidad_objetivo(weights, cov_matrix):
+    return np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)) * 252)
+
+def _volatilidad_objetivo_jac(weights, cov_matrix):
+    return 252 * np.dot(cov_matrix, weights) / np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)) * 252)
+
+def _sharpe_objetivo(weights, mu, cov_matrix, risk_free_rate):
+    portfolio_return = np.dot(weights, mu) * 252
+    portfolio_std = np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)) * 252)
+    return -(portfolio_return - risk_free_rate) / portfolio_std  # Negativo para maximización
+
+def _sharpe_objetivo_jac(weights, mu, cov_matrix, risk_free_rate):
+    portfolio_return = np.dot(weights, mu) * 252
+    portfolio_std = np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)) * 252)
+    d_std = 252 * np.dot(cov_matrix, weights) / portfolio_std
+    return -(252 * mu * portfolio_std - (portfolio_return - risk_free_rate) * d_std) / portfolio_std**2
+
+
+@st.cache_data(show_spinner=False)
 def calcular_minima_volatilidad_objetivo(returns, target_return=0.10):
     n = returns.shape[1]
+    mu, cov_matrix = calcular_momentos(returns)
     
-    # Función objetivo: minimizar la varianza del portafolio
-    def portfolio_volatility(weights):
-        cov_matrix = returns.cov()
-        return np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)) * 252)
-
     # Restricciones
     constraints = [
-        {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1},  # Pesos deben sumar 1
-        {'type': 'eq', 'fun': lambda weights: np.dot(weights, returns.mean() * 252) - target_return}  # Rendimiento objetivo anualizado
+        {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1, 'jac': lambda weights: np.ones_like(weights)},  # Pesos deben sumar 1
+        {'type': 'ineq', 'fun': lambda weights: weights @ mu * 252 - target_return, 'jac': lambda weights: mu * 252}  # Rendimiento anualizado de al menos el objetivo
     ]
     
     # Límites: los pesos deben estar entre 0 y 1
@@ -32,8 +65,8 @@ def calcular_minima_volatilidad_objetivo(returns, target_return=0.10):
     # Pesos iniciales iguales
     initial_weights = np.array([1 / n] * n)
     
-    # Optimización
-    result = minimize(portfolio_volatility, initial_weights, method='SLSQP', bounds=bounds, constraints=constraints)
+    # Optimización. Función objetivo: minimizar la volatilidad del portafolio
+    result = minimize(_volatilidad_objetivo, initial_weights, args=(cov_matrix,), jac=_volatilidad_objetivo_jac, method='SLSQP', bounds=bounds, constraints=constraints)
     
     return result.x  # Retorna los pesos óptimos
 
@@ -57,10 +90,17 @@ def calcular_riesgo_black_litterman(returns, P, Q, omega, tau=0.05):
     
     return riesgo
 
-def calcular_rendimiento_ventana(returns, window):
-    if len(returns) < window:
-        return np.nan
-    return (1 + returns.iloc[-window:]).prod() - 1
+def calcular_rendimientos_ventanas(returns, windows):
+    # Rendimiento acumulado de todas las ventanas a partir de un solo producto acumulado
+    returns = np.asarray(returns)
+    windows = np.asarray(windows)
+    crecimiento = np.cumprod(1 + returns, axis=0)
+    crecimiento = np.concatenate([np.ones((1,) + returns.shape[1:]), crecimiento])
+    validas = windows <= len(returns)
+    inicio = crecimiento[len(returns) - np.where(validas, windows, 0)]
+    resultado = crecimiento[-1] / inicio - 1
+    resultado[~validas] = np.nan
+    return resultado
 
 def calcular_sesgo(df):
     return df.skew()
@@ -69,69 +109,112 @@ def calcular_exceso_curtosis(returns):
     return returns.kurtosis()
 
 def calcular_ultimo_drawdown(series):
-    peak = series.expanding(min_periods=1).max()
-    drawdown = (series - peak) / peak
-    ultimo_drawdown = drawdown.iloc[-1]
+    # El máximo acumulado en el último punto es el máximo de toda la serie
+    series = np.asarray(series)
+    peak = series.max()
+    ultimo_drawdown = (series[-1] - peak) / peak
     return ultimo_drawdown
 
-def obtener_datos_acciones(simbolos, start_date, end_date):
-    data = yf.download(simbolos, start=start_date, end=end_date)['Close']
-    return data.ffill().dropna()
+@st.cache_data(ttl=3600, show_spinner=False)
+def descargar_precios(simbolos, start_date, end_date):
+    return yf.download(list(simbolos), start=start_date, end=end_date, threads=True)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def obtener_datos_acciones(simbolos, start_date, end_date, campo='Close', universo=()):
+    # Se descarga el universo completo para que cambiar la selección no dispare otra petición
+    data = descargar_precios(tuple(universo or simbolos), start_date, end_date)[campo]
+    if isinstance(data, pd.Series):  # Descarga de un solo símbolo sin columnas por ticker
+        data = data.to_frame(simbolos[0])
+    return data[list(simbolos)].ffill().dropna()
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def calcular_metricas(df):
-    returns = df.pct_change().dropna()
-    cumulative_returns = (1 + returns).cumprod() - 1
-    normalized_prices = df / df.iloc[0] * 100
+    # Los precios ya vienen sin huecos (ffill + dropna), así que se trabaja directo sobre el ndarray
+    prices = df.values
+    daily = prices[1:] / prices[:-1] - 1
+    returns = pd.DataFrame(daily, index=df.index[1:], columns=df.columns)
+    cumulative_returns = pd.DataFrame(np.cumprod(1 + daily, axis=0) - 1, index=df.index[1:], columns=df.columns)
+    normalized_prices = pd.DataFrame(100 * prices / prices[0], index=df.index, columns=df.columns)
     return returns, cumulative_returns, normalized_prices
 
 def calcular_rendimientos_portafolio(returns, weights):
-    return (returns * weights).sum(axis=1)
+    return pd.Series(returns.values @ np.asarray(weights, dtype=np.float64), index=returns.index)
 
-def calcular_sharpe_ratio(returns, risk_free_rate=0.02):
-    excess_returns = returns - risk_free_rate / 252
-    return np.sqrt(252) * excess_returns.mean() / excess_returns.std()
+# Versiones sobre ndarray: una sola reducción de NumPy en C, sin alineación de índices de pandas
+def _rendimiento_anualizado(r):
+    return r.mean() * 252
 
-def calcular_sortino_ratio(returns, risk_free_rate=0.02, target_return=0):
-    excess_returns = returns - risk_free_rate / 252
+def _volatilidad_anualizada(r):
+    return r.std(ddof=1) * SQRT252
+
+def _sharpe(r, risk_free_rate=0.02):
+    excess_returns = r - risk_free_rate / 252
+    return SQRT252 * excess_returns.mean() / excess_returns.std(ddof=1)
+
+def _sortino(r, risk_free_rate=0.02, target_return=0):
+    excess_returns = r - risk_free_rate / 252
     downside_returns = excess_returns[excess_returns < target_return]
     downside_deviation = np.sqrt(np.mean(downside_returns**2))
-    return np.sqrt(252) * excess_returns.mean() / downside_deviation if downside_deviation != 0 else np.nan
+    return SQRT252 * excess_returns.mean() / downside_deviation if downside_deviation != 0 else np.nan
+
+def calcular_rendimiento_anualizado(returns):
+    return _rendimiento_anualizado(np.asarray(returns, dtype=np.float64))
+
+def calcular_volatilidad_anualizada(returns):
+    return _volatilidad_anualizada(np.asarray(returns, dtype=np.float64))
+
+def calcular_sharpe_ratio(returns, risk_free_rate=0.02):
+    return _sharpe(np.asarray(returns, dtype=np.float64), risk_free_rate)
+
+def calcular_sortino_ratio(returns, risk_free_rate=0.02, target_return=0):
+    return _sortino(np.asarray(returns, dtype=np.float64), risk_free_rate, target_return)
 
 def calcular_beta(asset_returns, market_returns):
-    covariance = np.cov(asset_returns, market_returns)[0, 1]
-    market_variance = np.var(market_returns)
+    asset_returns = np.asarray(asset_returns)
+    market_returns = np.asarray(market_returns)
+    market_deviation = market_returns - market_returns.mean()
+    covariance = ((asset_returns - asset_returns.mean()) * market_deviation).mean()
+    market_variance = (market_deviation**2).mean()
     return covariance / market_variance if market_variance != 0 else np.nan
 
+def _indice_var(n, confidence):
+    # Estadístico de orden que nunca queda por encima del cuantil interpolado.
+    # Se redondea antes de ceil para que (1 - 0.95) * 20 = 1.0000000000000009 cuente como 1.
+    return max(int(np.ceil(round((1 - confidence) * n, 9))) - 1, 0)
+
 def calcular_var_cvar(returns, confidence=0.95):
-    VaR = returns.quantile(1 - confidence)
-    CVaR = returns[returns <= VaR].mean()
+    # Selección en tiempo lineal del cuantil en lugar de ordenar toda la serie
+    returns = np.asarray(returns)
+    if len(returns) == 0:
+        return np.nan, np.nan
+    k = _indice_var(len(returns), confidence)
+    partitioned = np.partition(returns, k)
+    VaR = partitioned[k]
+    CVaR = partitioned[:k + 1].mean()
     return VaR, CVaR
 
-def calcular_var_cvar_ventana(returns, window):
+def calcular_var_cvar_ventana(returns, window, confidence=0.95):
+    # Acepta una serie o una matriz (una columna por activo)
+    returns = np.asarray(returns)
     if len(returns) < window:
-        return np.nan, np.nan
-    window_returns = returns.iloc[-window:]
-    return calcular_var_cvar(window_returns)
+        return np.full(returns.shape[1:], np.nan), np.full(returns.shape[1:], np.nan)
+    k = _indice_var(window, confidence)
+    partitioned = np.partition(returns[-window:], k, axis=0)
+    VaR = partitioned[k]
+    CVaR = partitioned[:k + 1].mean(axis=0)
+    return VaR, CVaR
 
 def crear_histograma_distribucion(returns, var_95, cvar_95, title):
     fig = go.Figure()
     counts, bins = np.histogram(returns, bins=50)
-    mask_before_var = bins[:-1] <= var_95
-
-    fig.add_trace(go.Bar(
-        x=bins[:-1][mask_before_var],
-        y=counts[mask_before_var],
-        width=np.diff(bins)[mask_before_var],
-        name='Retornos < VaR',
-        marker_color='rgba(255, 69, 0, 0.8)'  # Rojo intenso
-    ))
 
+    # Una sola traza: rojo intenso para retornos < VaR, verde brillante para el resto
     fig.add_trace(go.Bar(
-        x=bins[:-1][~mask_before_var],
-        y=counts[~mask_before_var],
-        width=np.diff(bins)[~mask_before_var],
-        name='Retornos > VaR',
-        marker_color='rgba(50, 205, 50, 0.8)'  # Verde brillante
+        x=bins[:-1],
+        y=counts,
+        width=np.diff(bins),
+        name='Retornos',
+        marker_color=np.where(bins[:-1] <= var_95, 'rgba(255, 69, 0, 0.8)', 'rgba(50, 205, 50, 0.8)')
     ))
 
     fig.add_trace(go.Scatter(
@@ -163,16 +246,13 @@ def crear_histograma_distribucion(returns, var_95, cvar_95, title):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def calcular_minima_varianza(returns):
     n = returns.shape[1]
-    
-    # Función objetivo: minimizar la varianza
-    def portfolio_variance(weights):
-        cov_matrix = returns.cov()
-        return np.dot(weights.T, np.dot(cov_matrix, weights))
+    _, cov_matrix = calcular_momentos(returns)
     
     # Restricciones: los pesos deben sumar 1
-    constraints = ({'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1})
+    constraints = ({'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1, 'jac': lambda weights: np.ones_like(weights)})
     
     # Límites: los pesos deben estar entre 0 y 1
     bounds = tuple((0, 1) for _ in range(n))
@@ -180,24 +260,29 @@ def calcular_minima_varianza(returns):
     # Pesos iniciales iguales
     initial_weights = np.array([1 / n] * n)
     
-    # Optimización
-    result = minimize(portfolio_variance, initial_weights, method='SLSQP', bounds=bounds, constraints=constraints)
+    # Optimización. Función objetivo: minimizar la varianza
+    result = minimize(_varianza_objetivo, initial_weights, args=(cov_matrix,), jac=_varianza_objetivo_jac, method='SLSQP', bounds=bounds, constraints=constraints)
     
     return result.x  # Retorna los pesos óptimos
 
 #Portafolio Maximo Sharpe Ratio
+@st.cache_data(show_spinner=False)
 def calcular_maximo_sharpe(returns, risk_free_rate=0.02):
     n = returns.shape[1]
+    mu, cov_matrix = calcular_momentos(returns)
+    
+    # Portafolio tangente en forma cerrada: w ∝ Σ⁻¹(μ - rf)
+    try:
+        raw_weights = np.linalg.solve(cov_matrix, mu - risk_free_rate / 252)
+    except np.linalg.LinAlgError:
+        raw_weights = None
     
-    # Función objetivo: maximizar el Sharpe Ratio
-    def negative_sharpe_ratio(weights):
-        portfolio_return = np.dot(weights, returns.mean()) * 252
-        portfolio_std = np.sqrt(np.dot(weights.T, np.dot(returns.cov() * 252, weights)))
-        sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_std
-        return -sharpe_ratio  # Negativo para maximización
+    # Si cumple con los límites (pesos no negativos) es también el óptimo restringido
+    if raw_weights is not None and np.all(raw_weights >= 0) and raw_weights.sum() > 0:
+        return raw_weights / raw_weights.sum()
     
     # Restricciones: los pesos deben sumar 1
-    constraints = ({'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1})
+    constraints = ({'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1, 'jac': lambda weights: np.ones_like(weights)})
     
     # Límites: los pesos deben estar entre 0 y 1
     bounds = tuple((0, 1) for _ in range(n))
@@ -205,8 +290,8 @@ def calcular_maximo_sharpe(returns, risk_free_rate=0.02):
     # Pesos iniciales iguales
     initial_weights = np.array([1 / n] * n)
     
-    # Optimización
-    result = minimize(negative_sharpe_ratio, initial_weights, method='SLSQP', bounds=bounds, constraints=constraints)
+    # Optimización. Función objetivo: maximizar el Sharpe Ratio
+    result = minimize(_sharpe_objetivo, initial_weights, args=(mu, cov_matrix, risk_free_rate), jac=_sharpe_objetivo_jac, method='SLSQP', bounds=bounds, constraints=constraints)
     
     return result.x  #
         
@@ -243,15 +328,31 @@ benchmark = benchmark_options[selected_benchmark]
 if len(simbolos) != len(pesos) or abs(sum(pesos) - 1) > 1e-6:
     st.sidebar.error("El número de símbolos debe coincidir con el número de pesos, y los pesos deben sumar 1.")
 else:
-    # Obtener datos
-    all_symbols = simbolos + [benchmark]
-    df_stocks = obtener_datos_acciones(all_symbols, start_date, end_date)
+    # Obtener datos: los ETFs y el benchmark se descargan (y se guardan en caché) por separado,
+    # así que cambiar de benchmark solo trae una serie nueva. El join por la izquierda conserva
+    # las fechas de los ETFs para que sus retornos no dependan del benchmark elegido.
+    df_stocks = obtener_datos_acciones(tuple(simbolos), start_date, end_date, universo=tuple(etfs_permitidos)).join(
+        obtener_datos_acciones((benchmark,), start_date, end_date), how='left'
+    ).ffill().dropna()
     returns, cumulative_returns, normalized_prices = calcular_metricas(df_stocks)
     
     # Rendimientos del portafolio
     portfolio_returns = calcular_rendimientos_portafolio(returns[simbolos], pesos)
     portfolio_cumulative_returns = (1 + portfolio_returns).cumprod() - 1
 
+    # VaR y CVaR del benchmark (se usan en varias pestañas)
+    var_bench, cvar_bench = calcular_var_cvar(returns[benchmark])
+
+    # Convertir los rendimientos a pesos mexicanos suponiendo un tipo de cambio simulado
+    tipo_cambio_usd_mxn = 17.0  # Puedes actualizar el tipo de cambio según sea necesario
+    returns_mxn = returns[simbolos] * tipo_cambio_usd_mxn
+
+    # Pesos óptimos de los tres portafolios (en caché entre ejecuciones)
+    min_var_weights = calcular_minima_varianza(returns[simbolos])
+    max_sharpe_weights = calcular_maximo_sharpe(returns[simbolos])
+    # Mínima volatilidad con un rendimiento objetivo del 10%
+    min_vol_weights = calcular_minima_volatilidad_objetivo(returns_mxn)
+
     # Crear pestañas
     tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["Análisis de Activos Individuales", "Análisis del Portafolio", "Portafolio Mínima Varianza", "Portafolio Max Sharpe Ratio","Portafolio Mínima Vol 10% obj", "BackTesting", "Portafolio Black Litterman"])
 
@@ -364,18 +465,16 @@ else:
         
         with col1:
             # Histograma para el activo seleccionado
-            var_asset, cvar_asset = calcular_var_cvar(returns[selected_asset])
             fig_hist_asset = crear_histograma_distribucion(
                 returns[selected_asset],
-                var_asset,
-                cvar_asset,
+                var_95,
+                cvar_95,
                 f'Distribución de Retornos - {selected_asset}'
             )
             st.plotly_chart(fig_hist_asset, use_container_width=True, key="hist_asset")
             
         with col2:
             # Histograma para el benchmark
-            var_bench, cvar_bench = calcular_var_cvar(returns[benchmark])
             fig_hist_bench = crear_histograma_distribucion(
                 returns[benchmark],
                 var_bench,
@@ -422,18 +521,16 @@ else:
             
         with col1:
             # Histograma para el portafolio
-            var_port, cvar_port = calcular_var_cvar(portfolio_returns)
             fig_hist_port = crear_histograma_distribucion(
                 portfolio_returns,
-                var_port,
-                cvar_port,
+                portfolio_var_95,
+                portfolio_cvar_95,
                 'Distribución de Retornos - Portafolio'
             )
             st.plotly_chart(fig_hist_port, use_container_width=True, key="hist_port")
             
         with col2:
             # Histograma para el benchmark
-            var_bench, cvar_bench = calcular_var_cvar(returns[benchmark])
             fig_hist_bench = crear_histograma_distribucion(
                 returns[benchmark],
                 var_bench,
@@ -446,41 +543,18 @@ else:
         st.subheader("Rendimientos y Métricas de Riesgo en Diferentes Ventanas de Tiempo")
         ventanas = [1, 7, 30, 90, 180, 252]
         
-        # Crear DataFrames separados para cada métrica
-        rendimientos_ventanas = pd.DataFrame(index=['Portafolio'] + simbolos + [selected_benchmark])
-        var_ventanas = pd.DataFrame(index=['Portafolio'] + simbolos + [selected_benchmark])
-        cvar_ventanas = pd.DataFrame(index=['Portafolio'] + simbolos + [selected_benchmark])
+        # Todas las series en una sola matriz: portafolio, activos y benchmark
+        R_all = np.column_stack([portfolio_returns.values, returns[simbolos].values, returns[benchmark].values])
+        etiquetas = ['Portafolio'] + simbolos + [selected_benchmark]
+        columnas = [f'{ventana}d' for ventana in ventanas]
         
-        for ventana in ventanas:
-            # Rendimientos
-            rendimientos_ventanas[f'{ventana}d'] = pd.Series({
-                'Portafolio': calcular_rendimiento_ventana(portfolio_returns, ventana),
-                **{symbol: calcular_rendimiento_ventana(returns[symbol], ventana) for symbol in simbolos},
-                selected_benchmark: calcular_rendimiento_ventana(returns[benchmark], ventana)
-            })
-            
-            # VaR y CVaR
-            var_temp = {}
-            cvar_temp = {}
-            
-            # Para el portafolio
-            port_var, port_cvar = calcular_var_cvar_ventana(portfolio_returns, ventana)
-            var_temp['Portafolio'] = port_var
-            cvar_temp['Portafolio'] = port_cvar
-            
-            # Para cada símbolo
-            for symbol in simbolos:
-                var, cvar = calcular_var_cvar_ventana(returns[symbol], ventana)
-                var_temp[symbol] = var
-                cvar_temp[symbol] = cvar
-            
-            # Para el benchmark
-            bench_var, bench_cvar = calcular_var_cvar_ventana(returns[benchmark], ventana)
-            var_temp[selected_benchmark] = bench_var
-            cvar_temp[selected_benchmark] = bench_cvar
-            
-            var_ventanas[f'{ventana}d'] = pd.Series(var_temp)
-            cvar_ventanas[f'{ventana}d'] = pd.Series(cvar_temp)
+        # Una fila por ventana (todas las series a la vez) que se transpone al final
+        riesgo_ventanas = [calcular_var_cvar_ventana(R_all, ventana) for ventana in ventanas]
+        
+        # Crear DataFrames separados para cada métrica
+        rendimientos_ventanas = pd.DataFrame(calcular_rendimientos_ventanas(R_all, ventanas).T, index=etiquetas, columns=columnas)
+        var_ventanas = pd.DataFrame(np.array([var for var, _ in riesgo_ventanas]).T, index=etiquetas, columns=columnas)
+        cvar_ventanas = pd.DataFrame(np.array([cvar for _, cvar in riesgo_ventanas]).T, index=etiquetas, columns=columnas)
         
         # Mostrar las tablas
         st.subheader("Rendimientos por Ventana")
@@ -502,348 +576,336 @@ else:
 
 
 
-with tab3:
-    st.header("Análisis del Portafolio de Mínima Varianza")
+    with tab3:
+        st.header("Análisis del Portafolio de Mínima Varianza")
     
-    # Calcular los pesos óptimos
-    min_var_weights = calcular_minima_varianza(returns[simbolos])
+        # Calcular métricas del portafolio de mínima varianza
+        min_var_returns = calcular_rendimientos_portafolio(returns[simbolos], min_var_weights)
+        min_var_cumulative = (1 + min_var_returns).cumprod() - 1
+        min_var_risk = calcular_volatilidad_anualizada(min_var_returns)
+        min_var_mean_return = calcular_rendimiento_anualizado(min_var_returns)
     
-    # Calcular métricas del portafolio de mínima varianza
-    min_var_returns = calcular_rendimientos_portafolio(returns[simbolos], min_var_weights)
-    min_var_cumulative = (1 + min_var_returns).cumprod() - 1
-    min_var_risk = np.sqrt(252) * min_var_returns.std()
-    min_var_mean_return = min_var_returns.mean() * 252  # Anualizado
-    
-    st.subheader("Pesos del Portafolio de Mínima Varianza")
-    weights_df = pd.DataFrame({
-        "ETF": simbolos,
-        "Peso Óptimo": min_var_weights
-    })
-    st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
-    
-    # Mostrar métricas clave
-    col1, col2 = st.columns(2)
-    col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{min_var_risk:.2%}")
-    col2.metric("Rendimiento Esperado Anualizado", f"{min_var_mean_return:.2%}")
-    
-    # Comparar rendimientos acumulados
-    fig_cumulative = go.Figure()
-    fig_cumulative.add_trace(go.Scatter(
-        x=min_var_cumulative.index, 
-        y=min_var_cumulative, 
-        name="Portafolio de Mínima Varianza",
-        line=dict(color='royalblue')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=portfolio_cumulative_returns.index, 
-        y=portfolio_cumulative_returns, 
-        name="Portafolio Actual",
-        line=dict(color='orange', dash='dot')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=cumulative_returns.index, 
-        y=cumulative_returns[benchmark], 
-        name=f"Benchmark: {selected_benchmark}",
-        line=dict(color='green', dash='dash')
-    ))
-    fig_cumulative.update_layout(
-        title="Comparación de Rendimientos Acumulados",
-        xaxis_title="Fecha",
-        yaxis_title="Rendimientos Acumulados",
-        plot_bgcolor='rgba(240,240,240,1)'
-    )
-    st.plotly_chart(fig_cumulative, use_container_width=True)
-    
-    # Distribución de rendimientos del portafolio de mínima varianza
-    var_95, cvar_95 = calcular_var_cvar(min_var_returns)
-    fig_dist = crear_histograma_distribucion(
-        min_var_returns,
-        var_95,
-        cvar_95,
-        title="Distribución de Retornos del Portafolio de Mínima Varianza"
-    )
-    st.plotly_chart(fig_dist, use_container_width=True)
-
-with tab4:
-    st.header("Análisis del Portafolio de Máximo Sharpe Ratio")
-    
-    # Calcular los pesos óptimos
-    max_sharpe_weights = calcular_maximo_sharpe(returns[simbolos])
+        st.subheader("Pesos del Portafolio de Mínima Varianza")
+        weights_df = pd.DataFrame({
+            "ETF": simbolos,
+            "Peso Óptimo": min_var_weights
+        })
+        st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
     
-    # Calcular métricas del portafolio de máximo Sharpe Ratio
-    max_sharpe_returns = calcular_rendimientos_portafolio(returns[simbolos], max_sharpe_weights)
-    max_sharpe_cumulative = (1 + max_sharpe_returns).cumprod() - 1
-    max_sharpe_risk = np.sqrt(252) * max_sharpe_returns.std()
-    max_sharpe_mean_return = max_sharpe_returns.mean() * 252  # Anualizado
-    risk_free_rate = 0.02
-    max_sharpe_ratio = (max_sharpe_mean_return - risk_free_rate) / max_sharpe_risk
-    
-    st.subheader("Pesos del Portafolio de Máximo Sharpe Ratio")
-    weights_df = pd.DataFrame({
-        "ETF": simbolos,
-        "Peso Óptimo": max_sharpe_weights
-    })
-    st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
-    
-    # Mostrar métricas clave
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{max_sharpe_risk:.2%}")
-    col2.metric("Rendimiento Esperado Anualizado", f"{max_sharpe_mean_return:.2%}")
-    col3.metric("Sharpe Ratio", f"{max_sharpe_ratio:.2f}")
-    
-    # Comparar rendimientos acumulados
-    fig_cumulative = go.Figure()
-    fig_cumulative.add_trace(go.Scatter(
-        x=max_sharpe_cumulative.index, 
-        y=max_sharpe_cumulative, 
-        name="Portafolio de Máximo Sharpe Ratio",
-        line=dict(color='gold')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=portfolio_cumulative_returns.index, 
-        y=portfolio_cumulative_returns, 
-        name="Portafolio Actual",
-        line=dict(color='orange', dash='dot')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=cumulative_returns.index, 
-        y=cumulative_returns[benchmark], 
-        name=f"Benchmark: {selected_benchmark}",
-        line=dict(color='green', dash='dash')
-    ))
-    fig_cumulative.update_layout(
-        title="Comparación de Rendimientos Acumulados",
-        xaxis_title="Fecha",
-        yaxis_title="Rendimientos Acumulados",
-        plot_bgcolor='rgba(240,240,240,1)'
-    )
-    st.plotly_chart(fig_cumulative, use_container_width=True)
-    
-    # Distribución de rendimientos del portafolio de máximo Sharpe Ratio
-    var_95, cvar_95 = calcular_var_cvar(max_sharpe_returns)
-    fig_dist = crear_histograma_distribucion(
-        max_sharpe_returns,
-        var_95,
-        cvar_95,
-        title="Distribución de Retornos del Portafolio de Máximo Sharpe Ratio"
-    )
-    st.plotly_chart(fig_dist, use_container_width=True)
-
-with tab5:
-    st.header("Portafolio de Mínima Volatilidad con Objetivo de Rendimiento (MXN)")
-
-    # Convertir los rendimientos a pesos mexicanos suponiendo un tipo de cambio simulado
-    tipo_cambio_usd_mxn = 17.0  # Puedes actualizar el tipo de cambio según sea necesario
-    returns_mxn = returns[simbolos] * tipo_cambio_usd_mxn
-    
-    # Calcular los pesos óptimos para el portafolio de mínima volatilidad con un rendimiento objetivo del 10%
-    min_vol_weights = calcular_minima_volatilidad_objetivo(returns_mxn)
-
-    # Calcular métricas del portafolio de mínima volatilidad con rendimiento objetivo
-    min_vol_returns = calcular_rendimientos_portafolio(returns_mxn, min_vol_weights)
-    min_vol_cumulative = (1 + min_vol_returns).cumprod() - 1
-    min_vol_risk = np.sqrt(252) * min_vol_returns.std()
-    min_vol_mean_return = min_vol_returns.mean() * 252  # Anualizado
-
-    st.subheader("Pesos del Portafolio de Mínima Volatilidad con Objetivo de Rendimiento")
-    weights_df = pd.DataFrame({
-        "ETF": simbolos,
-        "Peso Óptimo": min_vol_weights
-    })
-    st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
-
-    # Mostrar métricas clave
-    col1, col2 = st.columns(2)
-    col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{min_vol_risk:.2%}")
-    col2.metric("Rendimiento Esperado Anualizado", f"{min_vol_mean_return:.2%}")
-
-    # Comparar rendimientos acumulados
-    fig_cumulative = go.Figure()
-    fig_cumulative.add_trace(go.Scatter(
-        x=min_vol_cumulative.index, 
-        y=min_vol_cumulative, 
-        name="Portafolio de Mínima Volatilidad con Objetivo",
-        line=dict(color='blue')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=portfolio_cumulative_returns.index, 
-        y=portfolio_cumulative_returns, 
-        name="Portafolio Actual",
-        line=dict(color='orange', dash='dot')
-    ))
-    fig_cumulative.add_trace(go.Scatter(
-        x=cumulative_returns.index, 
-        y=cumulative_returns[benchmark], 
-        name=f"Benchmark: {selected_benchmark}",
-        line=dict(color='green', dash='dash')
-    ))
-    fig_cumulative.update_layout(
-        title="Comparación de Rendimientos Acumulados",
-        xaxis_title="Fecha",
-        yaxis_title="Rendimientos Acumulados",
-        plot_bgcolor='rgba(240,240,240,1)'
-    )
-    st.plotly_chart(fig_cumulative, use_container_width=True)
-    
-
-with tab6: 
-    # Rango de fechas para el backtesting
-    backtest_start = "2021-01-01"
-    backtest_end = "2023-12-31"
-    
-    # ETFs permitidos y benchmark
-    etfs_permitidos = ["IEI", "EMB", "SPY", "IEMG", "GLD"]
-    benchmark_symbol = "^GSPC"  # S&P500
-    
-    # Pesos óptimos de los portafolios
-    weights_min_var = np.array([0.2, 0.2, 0.2, 0.2, 0.2])  # Portafolio de Mínima Varianza
-    weights_max_sharpe = np.array([0.0, 0.0, 0.975, 0.0, 0.025])  # Portafolio de Máximo Sharpe Ratio
-    weights_min_vol_target = np.array([0.9248, 0.0, 0.0752, 0.0, 0.0])  # Portafolio de Mínima Volatilidad
-    weights_equal = np.array([1 / len(etfs_permitidos)] * len(etfs_permitidos))  # Portafolio Equitativo
-    
-    # Descargamos los datos
-    def obtener_datos(etfs, benchmark, start_date, end_date):
-        symbols = etfs + [benchmark]
-        data = yf.download(symbols, start=start_date, end=end_date)['Adj Close']
-        return data.ffill().dropna()
-    
-    # Calcular métricas de los portafolios
-    def calcular_metricas(returns, weights):
-        portfolio_returns = (returns * weights).sum(axis=1)
-        annual_return = portfolio_returns.mean() * 252
-        annual_volatility = portfolio_returns.std() * np.sqrt(252)
-        sharpe_ratio = (annual_return - 0.02) / annual_volatility
-        downside_returns = portfolio_returns[portfolio_returns < 0]
-        downside_deviation = np.sqrt(np.mean(downside_returns**2)) * np.sqrt(252)
-        sortino_ratio = annual_return / downside_deviation if downside_deviation != 0 else np.nan
-        var_95 = portfolio_returns.quantile(0.05)
-        cvar_95 = portfolio_returns[portfolio_returns <= var_95].mean()
-        cumulative_return = (1 + portfolio_returns).prod() - 1
-        skewness = portfolio_returns.skew()
-        kurtosis = portfolio_returns.kurtosis()
-        drawdown = calcular_ultimo_drawdown((1 + portfolio_returns).cumprod())
-        return {
-            "Rendimiento Anualizado": annual_return,
-            "Volatilidad Anualizada": annual_volatility,
-            "Sharpe Ratio": sharpe_ratio,
-            "Sortino Ratio": sortino_ratio,
-            "VaR 95%": var_95,
-            "CVaR 95%": cvar_95,
-            "Sesgo": skewness,
-            "Exceso de Curtosis": kurtosis,
-            "Drawdown": drawdown,
-            "Rendimiento Acumulado": cumulative_return
-        }
-    
-    # Calcular el drawdown máximo
-    def calcular_ultimo_drawdown(cumulative_returns):
-        peak = cumulative_returns.expanding(min_periods=1).max()
-        drawdown = (cumulative_returns - peak) / peak
-        return drawdown.min()
-    
-    # Descargar los datos
-    
-    data = obtener_datos(etfs_permitidos, benchmark_symbol, backtest_start, backtest_end)
-    returns = data.pct_change().dropna()
-    
-    # Calcular métricas para cada portafolio
-    metrics = {}
-    metrics["Mínima Varianza"] = calcular_metricas(returns[etfs_permitidos], weights_min_var)
-    metrics["Máximo Sharpe Ratio"] = calcular_metricas(returns[etfs_permitidos], weights_max_sharpe)
-    metrics["Mínima Volatilidad"] = calcular_metricas(returns[etfs_permitidos], weights_min_vol_target)
-    metrics["Equitativo"] = calcular_metricas(returns[etfs_permitidos], weights_equal)
-    metrics["Benchmark"] = calcular_metricas(returns[[benchmark_symbol]], [1])
-    
-    # Mostrar resultados
-    st.header("Resultados del Backtesting (2021-2023)")
-    metrics_df = pd.DataFrame(metrics).T
-    st.dataframe(metrics_df.style.format(
-        "{:.2%}", subset=["Rendimiento Anualizado", "Volatilidad Anualizada", "Rendimiento Acumulado"]
-    ).format(
-        "{:.2f}", subset=["Sharpe Ratio", "Sortino Ratio", "VaR 95%", "CVaR 95%", "Sesgo", "Exceso de Curtosis", "Drawdown"]
-    ))
-    
-    # Gráfico de rendimientos acumulados
-    st.subheader("Comparación de Rendimientos Acumulados")
-    fig = go.Figure()
-    for name, weights in zip(["Mínima Varianza", "Máximo Sharpe Ratio", "Mínima Volatilidad", "Equitativo"],
-                             [weights_min_var, weights_max_sharpe, weights_min_vol_target, weights_equal]):
-        cumulative_returns = (1 + (returns[etfs_permitidos] * weights).sum(axis=1)).cumprod()
-        fig.add_trace(go.Scatter(x=cumulative_returns.index, y=cumulative_returns, name=name))
-    
-    benchmark_cumulative = (1 + returns[benchmark_symbol]).cumprod()
-    fig.add_trace(go.Scatter(x=benchmark_cumulative.index, y=benchmark_cumulative, name="Benchmark"))
-    fig.update_layout(title="Rendimientos Acumulados", xaxis_title="Fecha", yaxis_title="Rendimiento Acumulado")
-    st.plotly_chart(fig)
-    
-    st.markdown("""
-    <style>
-        .title {
-            font-size: 24px;
-            font-weight: bold;
-            color: #4CAF50;
-            text-align: center;
-            margin-bottom: 20px;
-        }
-        .subtitle {
-            font-size: 18px;
-            font-weight: bold;
-            color: #333;
-            margin-top: 15px;
-        }
-        .paragraph {
-            font-size: 16px;
-            color: #555;
-            text-align: justify;
-            line-height: 1.6;
-            margin-bottom: 15px;
-        }
-        .highlight {
-            font-size: 16px;
-            color: #FF5722;
-            font-weight: bold;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
-    # Título principal
-    st.markdown("<div class='title'>Comparación entre el Benchmark (S&P 500) y un Portafolio Equitativo: Un Análisis de Desempeño (2021-2023)</div>", unsafe_allow_html=True)
-    
-    # Texto del análisis
-    st.markdown("<div class='paragraph'>La evaluación de estrategias de inversión es fundamental para los inversionistas que buscan maximizar el rendimiento ajustado al riesgo de su portafolio. En este análisis, se comparan dos opciones: el benchmark, representado por el S&P 500 (SPY), y un portafolio equitativo que asigna los recursos de manera uniforme entre un grupo de ETFs. Utilizando métricas clave como rendimiento anualizado, volatilidad, ratios de desempeño, y métricas de riesgo extremo, se analizarán las diferencias entre ambas opciones para determinar cuál habría sido la mejor alternativa en el periodo 2021-2023.</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='subtitle'>1. Rendimiento Anualizado y Acumulado</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>El rendimiento anualizado del benchmark fue de <span class='highlight'>10.05%</span>, significativamente superior al <span class='highlight'>1.10%</span> obtenido por el portafolio equitativo. Este diferencial es aún más evidente al observar el rendimiento acumulado, donde el S&P 500 generó un crecimiento del <span class='highlight'>28.89%</span> frente al <span class='highlight'>1.83%</span> del portafolio equitativo.</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='subtitle'>2. Análisis de Riesgo y Volatilidad</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>El portafolio equitativo presentó una volatilidad anualizada de <span class='highlight'>9.89%</span>, considerablemente menor que el <span class='highlight'>17.59%</span> del benchmark. Esta menor volatilidad sugiere fluctuaciones más controladas, pero no suficientes para compensar el bajo rendimiento.</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='subtitle'>3. Desempeño Ajustado al Riesgo</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>El Sharpe Ratio del benchmark fue de <span class='highlight'>0.46</span>, mientras que el del portafolio equitativo fue <span class='highlight'>-0.09</span>. El Sortino Ratio muestra un patrón similar: <span class='highlight'>0.57</span> para el benchmark frente a <span class='highlight'>0.11</span> del portafolio equitativo.</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='subtitle'>4. Riesgo Extremo: VaR y CVaR</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>En términos de riesgos extremos, el Value at Risk (VaR) al 95% fue de <span class='highlight'>-2%</span> para el benchmark y de <span class='highlight'>-1%</span> para el portafolio equitativo. Similarmente, el CVaR al 95% fue de <span class='highlight'>-3%</span> y <span class='highlight'>-1%</span>, respectivamente.</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='subtitle'>5. Otras Métricas</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>El sesgo del portafolio equitativo fue positivo (<span class='highlight'>0.21</span>), mientras que el del benchmark fue negativo (<span class='highlight'>-0.15</span>). El exceso de curtosis fue mayor en el portafolio equitativo (<span class='highlight'>2.45</span>), indicando mayor frecuencia de eventos extremos. Finalmente, el drawdown máximo fue menor para el portafolio equitativo (<span class='highlight'>-21%</span>) que para el benchmark (<span class='highlight'>-25%</span>).</div>", unsafe_allow_html=True)
+        # Mostrar métricas clave
+        col1, col2 = st.columns(2)
+        col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{min_var_risk:.2%}")
+        col2.metric("Rendimiento Esperado Anualizado", f"{min_var_mean_return:.2%}")
     
-    st.markdown("<div class='subtitle'>Conclusión</div>", unsafe_allow_html=True)
-    st.markdown("<div class='paragraph'>En términos generales, el benchmark (S&P 500) ofreció mayores retornos y una mejor relación riesgo-retorno. Aunque el portafolio equitativo presentó menor volatilidad y riesgos extremos más controlados, su bajo rendimiento lo hace menos atractivo para inversionistas enfocados en maximizar el crecimiento del capital.</div>", unsafe_allow_html=True)
-
+        # Comparar rendimientos acumulados
+        fig_cumulative = go.Figure()
+        fig_cumulative.add_trace(go.Scatter(
+            x=min_var_cumulative.index, 
+            y=min_var_cumulative, 
+            name="Portafolio de Mínima Varianza",
+            line=dict(color='royalblue')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=portfolio_cumulative_returns.index, 
+            y=portfolio_cumulative_returns, 
+            name="Portafolio Actual",
+            line=dict(color='orange', dash='dot')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=cumulative_returns.index, 
+            y=cumulative_returns[benchmark], 
+            name=f"Benchmark: {selected_benchmark}",
+            line=dict(color='green', dash='dash')
+        ))
+        fig_cumulative.update_layout(
+            title="Comparación de Rendimientos Acumulados",
+            xaxis_title="Fecha",
+            yaxis_title="Rendimientos Acumulados",
+            plot_bgcolor='rgba(240,240,240,1)'
+        )
+        st.plotly_chart(fig_cumulative, use_container_width=True)
+    
+        # Distribución de rendimientos del portafolio de mínima varianza
+        var_95, cvar_95 = calcular_var_cvar(min_var_returns)
+        fig_dist = crear_histograma_distribucion(
+            min_var_returns,
+            var_95,
+            cvar_95,
+            title="Distribución de Retornos del Portafolio de Mínima Varianza"
+        )
+        st.plotly_chart(fig_dist, use_container_width=True)
+
+    with tab4:
+        st.header("Análisis del Portafolio de Máximo Sharpe Ratio")
+    
+        # Calcular métricas del portafolio de máximo Sharpe Ratio
+        max_sharpe_returns = calcular_rendimientos_portafolio(returns[simbolos], max_sharpe_weights)
+        max_sharpe_cumulative = (1 + max_sharpe_returns).cumprod() - 1
+        max_sharpe_risk = calcular_volatilidad_anualizada(max_sharpe_returns)
+        max_sharpe_mean_return = calcular_rendimiento_anualizado(max_sharpe_returns)
+        risk_free_rate = 0.02
+        max_sharpe_ratio = (max_sharpe_mean_return - risk_free_rate) / max_sharpe_risk
+    
+        st.subheader("Pesos del Portafolio de Máximo Sharpe Ratio")
+        weights_df = pd.DataFrame({
+            "ETF": simbolos,
+            "Peso Óptimo": max_sharpe_weights
+        })
+        st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
+    
+        # Mostrar métricas clave
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{max_sharpe_risk:.2%}")
+        col2.metric("Rendimiento Esperado Anualizado", f"{max_sharpe_mean_return:.2%}")
+        col3.metric("Sharpe Ratio", f"{max_sharpe_ratio:.2f}")
     
+        # Comparar rendimientos acumulados
+        fig_cumulative = go.Figure()
+        fig_cumulative.add_trace(go.Scatter(
+            x=max_sharpe_cumulative.index, 
+            y=max_sharpe_cumulative, 
+            name="Portafolio de Máximo Sharpe Ratio",
+            line=dict(color='gold')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=portfolio_cumulative_returns.index, 
+            y=portfolio_cumulative_returns, 
+            name="Portafolio Actual",
+            line=dict(color='orange', dash='dot')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=cumulative_returns.index, 
+            y=cumulative_returns[benchmark], 
+            name=f"Benchmark: {selected_benchmark}",
+            line=dict(color='green', dash='dash')
+        ))
+        fig_cumulative.update_layout(
+            title="Comparación de Rendimientos Acumulados",
+            xaxis_title="Fecha",
+            yaxis_title="Rendimientos Acumulados",
+            plot_bgcolor='rgba(240,240,240,1)'
+        )
+        st.plotly_chart(fig_cumulative, use_container_width=True)
+    
+        # Distribución de rendimientos del portafolio de máximo Sharpe Ratio
+        var_95, cvar_95 = calcular_var_cvar(max_sharpe_returns)
+        fig_dist = crear_histograma_distribucion(
+            max_sharpe_returns,
+            var_95,
+            cvar_95,
+            title="Distribución de Retornos del Portafolio de Máximo Sharpe Ratio"
+        )
+        st.plotly_chart(fig_dist, use_container_width=True)
+
+    with tab5:
+        st.header("Portafolio de Mínima Volatilidad con Objetivo de Rendimiento (MXN)")
+
+        # Calcular métricas del portafolio de mínima volatilidad con rendimiento objetivo
+        min_vol_returns = calcular_rendimientos_portafolio(returns_mxn, min_vol_weights)
+        min_vol_cumulative = (1 + min_vol_returns).cumprod() - 1
+        min_vol_risk = calcular_volatilidad_anualizada(min_vol_returns)
+        min_vol_mean_return = calcular_rendimiento_anualizado(min_vol_returns)
+
+        st.subheader("Pesos del Portafolio de Mínima Volatilidad con Objetivo de Rendimiento")
+        weights_df = pd.DataFrame({
+            "ETF": simbolos,
+            "Peso Óptimo": min_vol_weights
+        })
+        st.dataframe(weights_df.style.format({"Peso Óptimo": "{:.2%}"}))
+
+        # Mostrar métricas clave
+        col1, col2 = st.columns(2)
+        col1.metric("Riesgo (Desviación Estándar Anualizada)", f"{min_vol_risk:.2%}")
+        col2.metric("Rendimiento Esperado Anualizado", f"{min_vol_mean_return:.2%}")
 
-with tab7:
-    st.title('Cálculo de Riesgo con el Modelo de Black-Litterman')
-    # Datos de ejempl
-    returns = pd.DataFrame({
-    'Asset1': np.random.normal(0.01, 0.02, 100),
-    'Asset2': np.random.normal(0.02, 0.03, 100),
-    'Asset3': np.random.normal(0.015, 0.025, 100)
-    })
-
-    P = np.array([[1, -1, 0], [0, 1, -1]])
-    Q = np.array([0.01, 0.02])
-    omega = np.diag([0.0001, 0.0001])
-    
-    riesgo = calcular_riesgo_black_litterman(returns, P, Q, omega)
-    st.write(f'El riesgo calculado es: {riesgo}')
+        # Comparar rendimientos acumulados
+        fig_cumulative = go.Figure()
+        fig_cumulative.add_trace(go.Scatter(
+            x=min_vol_cumulative.index, 
+            y=min_vol_cumulative, 
+            name="Portafolio de Mínima Volatilidad con Objetivo",
+            line=dict(color='blue')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=portfolio_cumulative_returns.index, 
+            y=portfolio_cumulative_returns, 
+            name="Portafolio Actual",
+            line=dict(color='orange', dash='dot')
+        ))
+        fig_cumulative.add_trace(go.Scatter(
+            x=cumulative_returns.index, 
+            y=cumulative_returns[benchmark], 
+            name=f"Benchmark: {selected_benchmark}",
+            line=dict(color='green', dash='dash')
+        ))
+        fig_cumulative.update_layout(
+            title="Comparación de Rendimientos Acumulados",
+            xaxis_title="Fecha",
+            yaxis_title="Rendimientos Acumulados",
+            plot_bgcolor='rgba(240,240,240,1)'
+        )
+        st.plotly_chart(fig_cumulative, use_container_width=True)
+    
+
+    with tab6: 
+        # Rango de fechas para el backtesting
+        backtest_start = "2021-01-01"
+        backtest_end = "2023-12-31"
+    
+        # ETFs permitidos y benchmark
+        etfs_permitidos = ["IEI", "EMB", "SPY", "IEMG", "GLD"]
+        benchmark_symbol = "^GSPC"  # S&P500
+    
+        # Pesos óptimos de los portafolios
+        weights_min_var = np.array([0.2, 0.2, 0.2, 0.2, 0.2])  # Portafolio de Mínima Varianza
+        weights_max_sharpe = np.array([0.0, 0.0, 0.975, 0.0, 0.025])  # Portafolio de Máximo Sharpe Ratio
+        weights_min_vol_target = np.array([0.9248, 0.0, 0.0752, 0.0, 0.0])  # Portafolio de Mínima Volatilidad
+        weights_equal = np.array([1 / len(etfs_permitidos)] * len(etfs_permitidos))  # Portafolio Equitativo
+    
+        # Descargamos los datos (se reutiliza la descarga del análisis principal, que cubre 2010-2023)
+        def obtener_datos(etfs, benchmark, backtest_start, backtest_end):
+            data = obtener_datos_acciones(tuple(etfs), start_date, end_date, campo='Adj Close', universo=tuple(etfs_permitidos)).join(
+                obtener_datos_acciones((benchmark,), start_date, end_date, campo='Adj Close'), how='left'
+            ).ffill().dropna()
+            return data.loc[backtest_start:backtest_end]
+    
+        # Calcular métricas de los portafolios
+        def calcular_metricas(returns, weights):
+            portfolio_returns = (returns * weights).sum(axis=1)
+            annual_return = portfolio_returns.mean() * 252
+            annual_volatility = portfolio_returns.std() * np.sqrt(252)
+            sharpe_ratio = (annual_return - 0.02) / annual_volatility
+            downside_returns = portfolio_returns[portfolio_returns < 0]
+            downside_deviation = np.sqrt(np.mean(downside_returns**2)) * np.sqrt(252)
+            sortino_ratio = annual_return / downside_deviation if downside_deviation != 0 else np.nan
+            var_95, cvar_95 = calcular_var_cvar(portfolio_returns)
+            cumulative_return = (1 + portfolio_returns).prod() - 1
+            skewness = portfolio_returns.skew()
+            kurtosis = portfolio_returns.kurtosis()
+            drawdown = calcular_ultimo_drawdown((1 + portfolio_returns).cumprod())
+            return {
+                "Rendimiento Anualizado": annual_return,
+                "Volatilidad Anualizada": annual_volatility,
+                "Sharpe Ratio": sharpe_ratio,
+                "Sortino Ratio": sortino_ratio,
+                "VaR 95%": var_95,
+                "CVaR 95%": cvar_95,
+                "Sesgo": skewness,
+                "Exceso de Curtosis": kurtosis,
+                "Drawdown": drawdown,
+                "Rendimiento Acumulado": cumulative_return
+            }
+    
+        # Calcular el drawdown máximo
+        def calcular_ultimo_drawdown(cumulative_returns):
+            cumulative_returns = np.asarray(cumulative_returns)
+            peak = np.maximum.accumulate(cumulative_returns)
+            drawdown = (cumulative_returns - peak) / peak
+            return drawdown.min()
+    
+        # Descargar los datos
+    
+        data = obtener_datos(tuple(etfs_permitidos), benchmark_symbol, backtest_start, backtest_end)
+        returns = data.pct_change().dropna()
+    
+        # Calcular métricas para cada portafolio
+        metrics = {}
+        metrics["Mínima Varianza"] = calcular_metricas(returns[etfs_permitidos], weights_min_var)
+        metrics["Máximo Sharpe Ratio"] = calcular_metricas(returns[etfs_permitidos], weights_max_sharpe)
+        metrics["Mínima Volatilidad"] = calcular_metricas(returns[etfs_permitidos], weights_min_vol_target)
+        metrics["Equitativo"] = calcular_metricas(returns[etfs_permitidos], weights_equal)
+        metrics["Benchmark"] = calcular_metricas(returns[[benchmark_symbol]], [1])
+    
+        # Mostrar resultados
+        st.header("Resultados del Backtesting (2021-2023)")
+        metrics_df = pd.DataFrame(metrics).T
+        st.dataframe(metrics_df.style.format(
+            "{:.2%}", subset=["Rendimiento Anualizado", "Volatilidad Anualizada", "Rendimiento Acumulado"]
+        ).format(
+            "{:.2f}", subset=["Sharpe Ratio", "Sortino Ratio", "VaR 95%", "CVaR 95%", "Sesgo", "Exceso de Curtosis", "Drawdown"]
+        ))
+    
+        # Gráfico de rendimientos acumulados
+        st.subheader("Comparación de Rendimientos Acumulados")
+        fig = go.Figure()
+        for name, weights in zip(["Mínima Varianza", "Máximo Sharpe Ratio", "Mínima Volatilidad", "Equitativo"],
+                                 [weights_min_var, weights_max_sharpe, weights_min_vol_target, weights_equal]):
+            cumulative_returns = (1 + (returns[etfs_permitidos] * weights).sum(axis=1)).cumprod()
+            fig.add_trace(go.Scatter(x=cumulative_returns.index, y=cumulative_returns, name=name))
+    
+        benchmark_cumulative = (1 + returns[benchmark_symbol]).cumprod()
+        fig.add_trace(go.Scatter(x=benchmark_cumulative.index, y=benchmark_cumulative, name="Benchmark"))
+        fig.update_layout(title="Rendimientos Acumulados", xaxis_title="Fecha", yaxis_title="Rendimiento Acumulado")
+        st.plotly_chart(fig)
+    
+        st.markdown("""
+        <style>
+            .title {
+                font-size: 24px;
+                font-weight: bold;
+                color: #4CAF50;
+                text-align: center;
+                margin-bottom: 20px;
+            }
+            .subtitle {
+                font-size: 18px;
+                font-weight: bold;
+                color: #333;
+                margin-top: 15px;
+            }
+            .paragraph {
+                font-size: 16px;
+                color: #555;
+                text-align: justify;
+                line-height: 1.6;
+                margin-bottom: 15px;
+            }
+            .highlight {
+                font-size: 16px;
+                color: #FF5722;
+                font-weight: bold;
+            }
+            </style>
+            """, unsafe_allow_html=True)
+
+        # Título principal
+        st.markdown("<div class='title'>Comparación entre el Benchmark (S&P 500) y un Portafolio Equitativo: Un Análisis de Desempeño (2021-2023)</div>", unsafe_allow_html=True)
+    
+        # Texto del análisis
+        st.markdown("<div class='paragraph'>La evaluación de estrategias de inversión es fundamental para los inversionistas que buscan maximizar el rendimiento ajustado al riesgo de su portafolio. En este análisis, se comparan dos opciones: el benchmark, representado por el S&P 500 (SPY), y un portafolio equitativo que asigna los recursos de manera uniforme entre un grupo de ETFs. Utilizando métricas clave como rendimiento anualizado, volatilidad, ratios de desempeño, y métricas de riesgo extremo, se analizarán las diferencias entre ambas opciones para determinar cuál habría sido la mejor alternativa en el periodo 2021-2023.</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>1. Rendimiento Anualizado y Acumulado</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>El rendimiento anualizado del benchmark fue de <span class='highlight'>10.05%</span>, significativamente superior al <span class='highlight'>1.10%</span> obtenido por el portafolio equitativo. Este diferencial es aún más evidente al observar el rendimiento acumulado, donde el S&P 500 generó un crecimiento del <span class='highlight'>28.89%</span> frente al <span class='highlight'>1.83%</span> del portafolio equitativo.</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>2. Análisis de Riesgo y Volatilidad</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>El portafolio equitativo presentó una volatilidad anualizada de <span class='highlight'>9.89%</span>, considerablemente menor que el <span class='highlight'>17.59%</span> del benchmark. Esta menor volatilidad sugiere fluctuaciones más controladas, pero no suficientes para compensar el bajo rendimiento.</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>3. Desempeño Ajustado al Riesgo</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>El Sharpe Ratio del benchmark fue de <span class='highlight'>0.46</span>, mientras que el del portafolio equitativo fue <span class='highlight'>-0.09</span>. El Sortino Ratio muestra un patrón similar: <span class='highlight'>0.57</span> para el benchmark frente a <span class='highlight'>0.11</span> del portafolio equitativo.</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>4. Riesgo Extremo: VaR y CVaR</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>En términos de riesgos extremos, el Value at Risk (VaR) al 95% fue de <span class='highlight'>-2%</span> para el benchmark y de <span class='highlight'>-1%</span> para el portafolio equitativo. Similarmente, el CVaR al 95% fue de <span class='highlight'>-3%</span> y <span class='highlight'>-1%</span>, respectivamente.</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>5. Otras Métricas</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>El sesgo del portafolio equitativo fue positivo (<span class='highlight'>0.21</span>), mientras que el del benchmark fue negativo (<span class='highlight'>-0.15</span>). El exceso de curtosis fue mayor en el portafolio equitativo (<span class='highlight'>2.45</span>), indicando mayor frecuencia de eventos extremos. Finalmente, el drawdown máximo fue menor para el portafolio equitativo (<span class='highlight'>-21%</span>) que para el benchmark (<span class='highlight'>-25%</span>).</div>", unsafe_allow_html=True)
+    
+        st.markdown("<div class='subtitle'>Conclusión</div>", unsafe_allow_html=True)
+        st.markdown("<div class='paragraph'>En términos generales, el benchmark (S&P 500) ofreció mayores retornos y una mejor relación riesgo-retorno. Aunque el portafolio equitativo presentó menor volatilidad y riesgos extremos más controlados, su bajo rendimiento lo hace menos atractivo para inversionistas enfocados en maximizar el crecimiento del capital.</div>", unsafe_allow_html=True)
+
+    
+
+    with tab7:
+        st.title('Cálculo de Riesgo con el Modelo de Black-Litterman')
+        # Datos de ejempl
+        returns = pd.DataFrame({
+        'Asset1': np.random.normal(0.01, 0.02, 100),
+        'Asset2': np.random.normal(0.02, 0.03, 100),
+        'Asset3': np.random.normal(0.015, 0.025, 100)
+        })
+
+        P = np.array([[1, -1, 0], [0, 1, -1]])
+        Q = np.array([0.01, 0.02])
+        omega = np.diag([0.0001, 0.0001])
+    
+        riesgo = calcular_riesgo_black_litterman(returns, P, Q, omega)
+        st.write(f'El riesgo calculado es: {riesgo}')